@@ -0,0 +1,303 @@
+"""
+Throughput benchmarks for log_data.PY on synthetic operator logs.
+
+    python benchmark_log_data.py parser --lines 2000000
+    python benchmark_log_data.py parser --lines 2000000 --baseline old_log_data.PY
+    python benchmark_log_data.py summary --users 50 200 800 --rows 10000 100000
+    python benchmark_log_data.py memory --files 30 --lines 100000 --baseline old_log_data.PY
+
+--baseline takes any other copy of the script, e.g. one taken from git:
+
+    git show <rev>:log_data.PY > old_log_data.PY
+"""
+import argparse
+import contextlib
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from importlib.machinery import SourceFileLoader
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+USERS = ["operator01", "operator02", "operator03", "operator04"]
+SHORTCUTS = ["ctrl+s", "F5", "alt+n", "Down"]
+CLIPBOARD_TEXTS = ["Juan Perez", "Maria", "Ana de la Cruz", "1890"]
+COLUMNS = ["NAME", "SURNAME", "AGE", "BIRTH_PLACE"]
+
+
+def load_log_data(path=os.path.join(HERE, "log_data.PY"), name="log_data"):
+    """Import log_data.PY (or another copy of it) as a module."""
+    loader = SourceFileLoader(name, path)
+    spec = importlib.util.spec_from_file_location(name, path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def write_synthetic_log(path, num_lines, seed=0):
+    """Write a log with the same line mix an operator session produces."""
+    rnd = random.Random(seed)
+    current = datetime(2025, 3, 3, 8, 0, 0)
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(num_lines):
+            # Mostly 0-5 second steps, with an occasional idle period
+            current += timedelta(seconds=rnd.choice((0, 1, 1, 2, 5)) if rnd.random() > 0.005 else rnd.randint(120, 900))
+            ts = current.strftime("%Y-%m-%d %H:%M:%S")
+            r = rnd.random()
+            if i % 50000 == 0:
+                user = rnd.choice(USERS)
+                line = f"{ts} - config - INFO - Logging initialized for user: {user} on {ts[:10]}"
+            elif r < 0.08:
+                line = f"{ts} - scripts.config - INFO - Updated IMAGE_NUMBER to {rnd.randint(100, 999)}_00{rnd.randint(1, 9)} for all records of {rnd.randint(1000, 9999)}"
+            elif r < 0.18:
+                line = f"{ts} - scripts.config - INFO - UPDATED r_num TO {rnd.randint(1, 20)} of {rnd.randint(1000, 9999)}"
+            elif r < 0.35:
+                line = f"{ts} - scripts.config - INFO - UPDATED {rnd.choice(COLUMNS)} FROM old TO {rnd.choice(CLIPBOARD_TEXTS)} of {rnd.randint(1000, 9999)}"
+            elif r < 0.37:
+                line = f"{ts} - scripts.config - INFO - Updated DOC_TYPE for {rnd.randint(1, 9)} local records"
+            elif r < 0.42:
+                line = f"{ts} - scripts.config - INFO - HWR mode set to True"
+            elif r < 0.48:
+                line = f"{ts} - scripts.config - DEBUG - Text copied to clipboard: '{rnd.choice(CLIPBOARD_TEXTS)}'"
+            elif r < 0.53:
+                line = f"{ts} - scripts.config - INFO - {rnd.choice(SHORTCUTS)} pressed"
+            else:
+                line = f"{ts} - scripts.db - DEBUG - Fetched page {rnd.randint(1, 500)} from local cache"
+            file.write(line + "\n")
+
+
+def scan_all_patterns(module, log_file_path):
+    """The old main loop's matching cost: every pattern searched on every line."""
+    patterns = [
+        module.LOGIN_PATTERN, module.IMAGE_UPDATE_PATTERN, module.EDIT_PATTERN,
+        module.R_NUM_PATTERN, module.DOC_TYPE_UPDATE_PATTERN, module.TEXT_CLIPBOARD_PATTERN,
+        module.OCR_IMAGE_PATTERN, module.SHORTCUT_PATTERN, module.IMAGE_PATTERN_SHEET5,
+        module.RECORD_PATTERN_SHEET5, module.OCR_START_PATTERN, module.OCR_END_PATTERN,
+    ]
+    searches = [pattern.search for pattern in patterns]
+    with open(log_file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            for search in searches:
+                search(line)
+
+
+def scan_dispatched_patterns(module, log_file_path):
+    """The same matching with the analyzer's keyword checks: a pattern only runs when its keyword is in the line."""
+    m = module
+    with open(log_file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if m.LOGIN_MARKER in line:
+                m.LOGIN_PATTERN.search(line)
+            if m.OCR_START_KEYWORD in line:
+                m.OCR_START_PATTERN.search(line)
+            if m.CLIPBOARD_KEYWORD in line:
+                m.OCR_END_PATTERN.search(line)
+                m.TEXT_CLIPBOARD_PATTERN.search(line)
+            if m.IMAGE_UPDATE_KEYWORD in line:
+                m.IMAGE_PATTERN_SHEET5.search(line)
+                m.OCR_IMAGE_PATTERN.search(line)
+                m.IMAGE_UPDATE_PATTERN.search(line)
+            elif line[-2:-1].isdigit():
+                m.RECORD_PATTERN_SHEET5.search(line)
+            if m.SHORTCUT_KEYWORD in line:
+                m.SHORTCUT_PATTERN.search(line)
+            if m.DOC_TYPE_KEYWORD in line:
+                m.DOC_TYPE_UPDATE_PATTERN.search(line)
+            if m.UPDATE_KEYWORD in line:
+                if m.R_NUM_KEYWORD in line:
+                    m.R_NUM_PATTERN.search(line)
+                m.EDIT_PATTERN.search(line)
+
+
+def timed(label, num_lines, func, *args):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.2f}s {num_lines / elapsed:12,.0f} lines/s")
+    return elapsed
+
+
+def run_baseline(module, log_file_path):
+    """Old entry points: analyze_log_file followed by analyze_time_gaps."""
+    return module.analyze_log_file(log_file_path), module.analyze_time_gaps(log_file_path)
+
+
+def benchmark_parser(args):
+    module = load_log_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file_path = os.path.join(tmp, "synthetic.log")
+        print(f"Writing {args.lines:,} synthetic log lines...")
+        write_synthetic_log(log_file_path, args.lines, args.seed)
+
+        timed("old matching: every pattern, every line", args.lines, scan_all_patterns, module, log_file_path)
+        timed("new matching: keyword dispatch", args.lines, scan_dispatched_patterns, module, log_file_path)
+        timed("analyze_log_stream: full analysis", args.lines, module.analyze_log_stream, log_file_path)
+        if args.baseline:
+            baseline = load_log_data(args.baseline, "log_data_baseline")
+            timed(f"baseline {os.path.basename(args.baseline)}", args.lines, run_baseline, baseline, log_file_path)
+
+
+def retained_results(label, func, module, log_file_paths):
+    """Memory held by the results of every file, as process_log_folder keeps them until the report is written."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        tracemalloc.start()
+        results = [func(module, log_file_path) for log_file_path in log_file_paths]
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"{label:<40} {retained / 2**20:8.1f} MiB retained {peak / 2**20:8.1f} MiB peak")
+    return results
+
+
+def run_stream(module, log_file_path):
+    return module.analyze_log_stream(log_file_path)
+
+
+def benchmark_memory(args):
+    module = load_log_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file_paths = [os.path.join(tmp, f"day{n:02d}.log") for n in range(args.files)]
+        print(f"Writing {args.files} synthetic logs of {args.lines:,} lines...")
+        for n, log_file_path in enumerate(log_file_paths):
+            write_synthetic_log(log_file_path, args.lines, args.seed + n)
+
+        retained_results("analyze_log_stream", run_stream, module, log_file_paths)
+        if args.baseline:
+            baseline = load_log_data(args.baseline, "log_data_baseline")
+            retained_results(f"baseline {os.path.basename(args.baseline)}", run_baseline, baseline, log_file_paths)
+
+
+def make_report_rows(module, num_users, num_rows, seed=0):
+    """Synthetic all_sessions / all_ocr_data / all_shortcut_data / all_image_record_data lists."""
+    rnd = random.Random(seed)
+    users = [f"operator{n:04d}" for n in range(num_users)]
+    dates = [f"2025-03-{day:02d}" for day in range(1, 29)]
+    sessions, ocr_data, shortcut_data, image_record_data = [], [], [], []
+    for n in range(num_rows):
+        user, date = rnd.choice(users), rnd.choice(dates)
+        log_file = f"{user}_{date}.log"
+        session = module.Session(user, date, datetime(2025, 3, 3, 8, 0, 0), log_file)
+        session.duration_seconds = float(rnd.randint(0, 20000))
+        session.update_count = rnd.randint(0, 500)
+        session.character_count = rnd.randint(0, 5000)
+        sessions.append(session)
+        duration = float(rnd.randint(0, 60))
+        ocr_data.append(module.OcrRecord(
+            user, date, str(rnd.randint(1, num_rows)), "", rnd.randint(0, 10), duration, duration,
+            None, None, "", rnd.random() < 0.5, log_file,
+        ))
+        shortcut_data.append(module.ShortcutRecord(user, date, rnd.choice(SHORTCUTS), rnd.randint(1, 50), log_file))
+        image_record_data.append(module.ImageRecord(user, date, str(rnd.randint(1, num_rows)), rnd.randint(1, 20), log_file))
+    return sessions, ocr_data, shortcut_data, image_record_data
+
+
+def legacy_duration_summary(module, all_sessions, all_ocr_data, all_shortcut_data, all_image_record_data):
+    """The per-user rescanning loop build_duration_summary replaced, kept for comparison."""
+    import pandas as pd
+    format_time_duration = module.format_time_duration
+    unique_users = set(session.user for session in all_sessions)
+    dates = [session.date for session in all_sessions]
+    sheet3_data = []
+    total_duration = total_ocr_duration = total_name_ocr_duration = total_character_count = 0
+    for user in unique_users:
+        user_sessions = [s for s in all_sessions if s.user == user]
+        user_ocr_data = [o for o in all_ocr_data if o.user == user]
+        user_shortcut_data = [s for s in all_shortcut_data if s.user == user]
+        user_image_data = [i for i in all_image_record_data if i.user == user]
+        user_dates = [s.date for s in user_sessions]
+        user_duration = sum(s.duration_seconds for s in user_sessions)
+        total_duration += user_duration
+        user_ocr_duration = sum(o.total_ocr_duration for o in user_ocr_data)
+        total_ocr_duration += user_ocr_duration
+        user_name_ocr_duration = sum(o.total_ocr_duration for o in user_ocr_data if o.is_name_ocr)
+        total_name_ocr_duration += user_name_ocr_duration
+        user_character_count = sum(s.character_count for s in user_sessions)
+        total_character_count += user_character_count
+        sheet3_data.append({
+            "Username": user,
+            "Date Range": f"{min(user_dates)} to {max(user_dates)}" if user_dates else "N/A",
+            "Total Duration": format_time_duration(user_duration),
+            "Total OCR Attempts": sum(o.ocr_attempt for o in user_ocr_data),
+            "Total OCR Duration (seconds)": round(user_ocr_duration, 2),
+            "Total OCR Duration (formatted)": format_time_duration(user_ocr_duration),
+            "Total Name OCR Duration (seconds)": round(user_name_ocr_duration, 2),
+            "Total Name OCR Duration (formatted)": format_time_duration(user_name_ocr_duration),
+            "Total Images": len(set(o.image_id for o in user_ocr_data)),
+            "Total Shortcuts": sum(s.count for s in user_shortcut_data),
+            "Total Character Count": user_character_count,
+            "Total Images Processed": len(set(i.image for i in user_image_data)),
+            "Total Records Processed": sum(i.record_count for i in user_image_data),
+            "Total Field Edits": sum(s.update_count for s in user_sessions),
+            "Log Files Processed": len(set(session.log_file for session in user_sessions)),
+        })
+    sheet3_data.append({
+        "Username": "Total (All Users)",
+        "Date Range": f"{min(dates)} to {max(dates)}" if dates else "N/A",
+        "Total Duration": format_time_duration(total_duration),
+        "Total OCR Attempts": sum(item.ocr_attempt for item in all_ocr_data),
+        "Total OCR Duration (seconds)": round(total_ocr_duration, 2),
+        "Total OCR Duration (formatted)": format_time_duration(total_ocr_duration),
+        "Total Name OCR Duration (seconds)": round(total_name_ocr_duration, 2),
+        "Total Name OCR Duration (formatted)": format_time_duration(total_name_ocr_duration),
+        "Total Images": len(set(item.image_id for item in all_ocr_data)),
+        "Total Shortcuts": sum(item.count for item in all_shortcut_data),
+        "Total Character Count": total_character_count,
+        "Total Images Processed": len(set(item.image for item in all_image_record_data)),
+        "Total Records Processed": sum(item.record_count for item in all_image_record_data),
+        "Total Field Edits": sum(session.update_count for session in all_sessions),
+        "Log Files Processed": len(set(session.log_file for session in all_sessions)),
+    })
+    return pd.DataFrame(sheet3_data)
+
+
+def benchmark_summary(args):
+    import pandas as pd
+    module = load_log_data()
+    print(f"{'users':>6} {'rows':>9} {'loop':>9} {'groupby':>9} {'speedup':>8}")
+    for num_rows in args.rows:
+        for num_users in args.users:
+            rows = make_report_rows(module, num_users, num_rows, args.seed)
+            start = time.perf_counter()
+            expected = legacy_duration_summary(module, *rows)
+            loop_elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            summary = module.build_duration_summary(*rows)
+            groupby_elapsed = time.perf_counter() - start
+            pd.testing.assert_frame_equal(summary, expected)
+            print(f"{num_users:>6} {num_rows:>9,} {loop_elapsed:>8.2f}s {groupby_elapsed:>8.2f}s {loop_elapsed / groupby_elapsed:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    parser_bench = subparsers.add_parser("parser", help="lines per second of the log parser")
+    parser_bench.add_argument("--lines", type=int, default=2000000)
+    parser_bench.add_argument("--seed", type=int, default=0)
+    parser_bench.add_argument("--baseline", help="another log_data.PY to time end-to-end for comparison")
+    parser_bench.set_defaults(func=benchmark_parser)
+
+    summary_bench = subparsers.add_parser("summary", help="Duration and OCR Summary aggregation as users and rows grow")
+    summary_bench.add_argument("--users", type=int, nargs="+", default=[50, 200, 800])
+    summary_bench.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    summary_bench.add_argument("--seed", type=int, default=0)
+    summary_bench.set_defaults(func=benchmark_summary)
+
+    memory_bench = subparsers.add_parser("memory", help="memory held by the analysis results of a folder of logs")
+    memory_bench.add_argument("--files", type=int, default=30)
+    memory_bench.add_argument("--lines", type=int, default=100000)
+    memory_bench.add_argument("--seed", type=int, default=0)
+    memory_bench.add_argument("--baseline", help="another log_data.PY to measure for comparison")
+    memory_bench.set_defaults(func=benchmark_memory)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Tests for log_data.PY: timestamp parsing, the analysis cache and follow mode.
+
+    python -m pytest -q test_log_data.py
+"""
+import os
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from benchmark_log_data import load_log_data, write_synthetic_log
+
+log_data = load_log_data()
+
+
+def report_frames(results):
+    return log_data.build_report_frames(*results)
+
+
+def assert_same_report(results, expected):
+    frames, expected_frames = report_frames(results), report_frames(expected)
+    assert list(frames) == list(expected_frames)
+    for sheet_name, df in expected_frames.items():
+        pd.testing.assert_frame_equal(frames[sheet_name], df, obj=sheet_name)
+
+
+def test_parse_timestamp_matches_strptime():
+    rnd = random.Random(0)
+    start = datetime(1999, 1, 1)
+    samples = []
+    for _ in range(5000):
+        ts = (start + timedelta(seconds=rnd.randint(0, 40 * 365 * 86400))).strftime(log_data.TIMESTAMP_FORMAT)
+        samples.append(ts)
+        # Unpadded fields, out of range clocks and junk all have to fail or succeed like strptime
+        position = rnd.randrange(len(ts))
+        samples.append(ts[:position] + rnd.choice("0123456789 :-x") + ts[position + 1:])
+        samples.append(ts.replace("-0", "-", 1))
+    samples += ["", "2024-02-29 23:59:59", "2023-02-29 00:00:00", "2024-01-01 24:00:00", "2024-01-01 00:60:00", "abc"]
+
+    for ts in samples:
+        try:
+            expected = (datetime.strptime(ts, log_data.TIMESTAMP_FORMAT) - log_data.EPOCH).total_seconds()
+        except ValueError:
+            with pytest.raises(ValueError):
+                log_data.parse_timestamp(ts)
+        else:
+            assert log_data.parse_timestamp(ts) == expected, ts
+
+
+def test_cache_resumes_after_append_with_mid_line_cut(tmp_path, capsys):
+    log_file_path = str(tmp_path / "operator.log")
+    write_synthetic_log(log_file_path, 6000, seed=1)
+    with open(log_file_path, "rb") as file:
+        data = file.read()
+    # Cut in the middle of a line: the unterminated line must not be saved in the cache state
+    cut = data.index(b"\n", len(data) // 2) - 10
+    with open(log_file_path, "wb") as file:
+        file.write(data[:cut])
+    _, cache_entry = log_data.analyze_log_stream_incremental(log_file_path)
+
+    with open(log_file_path, "ab") as file:
+        file.write(data[cut:])
+    capsys.readouterr()
+    results, _ = log_data.analyze_log_stream_incremental(log_file_path, cache_entry)
+
+    assert "resuming at byte" in capsys.readouterr().out
+    assert_same_report(results, log_data.analyze_log_stream(log_file_path))
+
+
+def test_cache_reparses_file_rewritten_at_same_size(tmp_path, capsys):
+    log_file_path = str(tmp_path / "operator.log")
+    write_synthetic_log(log_file_path, 6000, seed=2)
+    _, cache_entry = log_data.analyze_log_stream_incremental(log_file_path)
+
+    with open(log_file_path, "rb") as file:
+        data = file.read()
+    # Same size, changed in the middle, where a sampled fingerprint would not look
+    position = data.index(b"INFO - F5 pressed", len(data) // 3)
+    with open(log_file_path, "wb") as file:
+        file.write(data[:position] + b"INFO - F6 pressed" + data[position + 17:])
+    stat = os.stat(log_file_path)
+    os.utime(log_file_path, ns=(stat.st_atime_ns, cache_entry["mtime"] + 1_000_000_000))
+    capsys.readouterr()
+    results, _ = log_data.analyze_log_stream_incremental(log_file_path, cache_entry)
+
+    output = capsys.readouterr().out
+    assert "unchanged" not in output and "resuming" not in output
+    assert_same_report(results, log_data.analyze_log_stream(log_file_path))
+
+
+def batch_user_metrics(log_file_path):
+    """Follow mode counters computed from a full batch analysis of one file"""
+    analyzer = log_data.LogFileAnalyzer(log_file_path, verbose=False)
+    with open(log_file_path, "rb") as file:
+        offset, partial_line = log_data._feed_log_lines(analyzer, file, 0)
+    if partial_line:
+        for line, line_offset in log_data._decode_log_lines(partial_line, offset):
+            analyzer.feed_line(line, line_offset)
+    ocr_images = {image_id: (image.user or "N/A", image.clipboard_count) for image_id, image in analyzer.ocr_records.items()}
+    ocr_durations = {image_id: sum(durations) for image_id, durations in analyzer.ocr_durations.items()}
+    name_ocr_durations = {image_id: sum(duration for duration, _, _, _ in name_ocrs)
+                          for image_id, name_ocrs in analyzer.ocr_durations_with_criteria.items()}
+    sessions, _, shortcut_data, _, time_gaps = analyzer.finish()
+
+    metrics = defaultdict(lambda: defaultdict(int))
+    for session in sessions:
+        metrics[session.user]["sessions"] += 1
+        metrics[session.user]["update_count"] += session.update_count
+        metrics[session.user]["character_count"] += session.character_count
+    for image_id, (user, clipboard_count) in ocr_images.items():
+        metrics[user]["ocr_attempts"] += clipboard_count
+        metrics[user]["ocr_seconds"] += ocr_durations.get(image_id, 0)
+        metrics[user]["name_ocr_seconds"] += name_ocr_durations.get(image_id, 0)
+    for shortcut in shortcut_data:
+        metrics[shortcut.user]["shortcuts"] += shortcut.count
+    for gap in time_gaps:
+        metrics[gap.user or "N/A"]["idle_gaps"] += 1
+        metrics[gap.user or "N/A"]["idle_seconds"] += gap.end_time - gap.start_time
+    return metrics
+
+
+def test_follow_counters_match_batch(tmp_path):
+    source = tmp_path / "source"
+    folder = tmp_path / "logs"
+    source.mkdir()
+    folder.mkdir()
+    rnd = random.Random(3)
+    contents = {}
+    for n in range(3):
+        path = str(source / f"day{n}.log")
+        write_synthetic_log(path, 4000, seed=n)
+        with open(path, "rb") as file:
+            contents[f"day{n}.log"] = file.read()
+    contents["day0.log"] = contents["day0.log"].rstrip(b"\n")  # last line without a newline
+
+    # Append each file in random pieces, cutting lines in the middle, with a poll after each round
+    cuts = {name: sorted(rnd.sample(range(1, len(data)), 5)) + [len(data)] for name, data in contents.items()}
+    follower = log_data.LogFolderFollower(str(folder))
+    written = dict.fromkeys(contents, 0)
+    for round_number in range(6):
+        for name, data in contents.items():
+            end = cuts[name][round_number]
+            with open(folder / name, "ab") as file:
+                file.write(data[written[name]:end])
+            written[name] = end
+        follower.poll()
+    # One more poll with nothing new feeds the unterminated last line
+    follower.poll()
+    snapshot = follower.snapshot()
+
+    expected = defaultdict(lambda: defaultdict(int))
+    for name in contents:
+        for user, metrics in batch_user_metrics(str(folder / name)).items():
+            for metric, value in metrics.items():
+                expected[user][metric] += value
+
+    assert snapshot["tail"]["bytes_behind"] == 0
+    assert set(snapshot["users"]) == {str(user) for user in expected}
+    for user, metrics in expected.items():
+        for metric, value in metrics.items():
+            assert snapshot["users"][str(user)][metric] == round(value, 2), (user, metric)
+    # Counted sessions, gaps and OCR durations are not kept by the analyzers
+    for log in follower.logs.values():
+        assert not log.analyzer.sessions and not log.analyzer.gaps and not log.analyzer.ocr_durations